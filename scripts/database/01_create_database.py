@@ -1,7 +1,15 @@
 import psycopg2
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from psycopg2 import sql
+from psycopg2.errors import DuplicateDatabase
+from psycopg2.pool import ThreadedConnectionPool
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT, make_dsn
+import atexit
+from contextlib import closing
+import hashlib
 import logging
+from logging.handlers import QueueHandler, QueueListener
 import os
+import queue
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -10,15 +18,24 @@ load_dotenv()
 # Set up logging
 log_dir = 'logs/01_create_database_logs'
 os.makedirs(log_dir, exist_ok=True)
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', filename=f'{log_dir}/database_setup.log')
-logger = logging.getLogger(__name__)
+log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+file_handler = logging.FileHandler(f'{log_dir}/database_setup.log')
+file_handler.setFormatter(log_formatter)
 
 # Also log to console
 console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-console_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(console_formatter)
-logger.addHandler(console_handler)
+console_handler.setFormatter(log_formatter)
+
+# Records are queued and written by a background thread, so database work never waits on log I/O
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, file_handler, console_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(QueueHandler(log_queue))
 
 # Get database connection parameters from .env
 DB_NAME = os.getenv("DB_NAME")
@@ -29,272 +46,121 @@ DB_PARAMS = {
     'port': os.getenv("DB_PORT")
 }
 
-def create_database_and_tables():
-    """Creates the database and tables needed for the EPD data."""
-
-    try:
-        # Connect to the PostgreSQL server (without specifying the database)
-        conn = psycopg2.connect(**DB_PARAMS)
-        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT) #important for database creation
-
-        cur = conn.cursor()
-
-        # Check if the database already exists
-        cur.execute(f"SELECT 1 FROM pg_database WHERE datname='{DB_NAME}'")
-        exists = cur.fetchone()
-
-        if not exists:
-            # Create the database if it doesn't exist
-            cur.execute(f"CREATE DATABASE {DB_NAME}")
-            logger.info(f"Database '{DB_NAME}' created successfully.")
-        else:
-            logger.info(f"Database '{DB_NAME}' already exists.")
-
-        # Close the initial connection
-        cur.close()
-        conn.close()
+# libpq connection strings, built once: the server itself (for CREATE DATABASE) and the target database
+SERVER_DSN = make_dsn(**DB_PARAMS)
+DB_DSN = make_dsn(SERVER_DSN, dbname=DB_NAME)
 
-        # Connect to the newly created database
-        conn = psycopg2.connect(dbname=DB_NAME, **DB_PARAMS)
-        cursor = conn.cursor()
+# DDL for all tables, executed as a single multi-statement query
+SCHEMA_FILE = os.path.join(os.path.dirname(__file__), "schema.sql")
 
-        # Create DataStocks table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS DataStocks (
-                datastock_id SERIAL PRIMARY KEY,
-                name TEXT NOT NULL,
-                uuid TEXT UNIQUE
-            )
-        ''')
-        logger.info("DataStocks table created successfully.")
+# LOAD_MODE=bulk creates UNLOGGED tables for the initial ingest: no WAL is written,
+# but their contents are lost on a crash. 02_store_epds_in_db.py sets them LOGGED
+# once loading finishes; a failed load can simply be replayed from the source files.
+BULK_LOAD = os.getenv("LOAD_MODE") == "bulk"
 
-        # Create Products table with datastock reference
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Products (
-                process_id TEXT PRIMARY KEY,
-                uuid TEXT,
-                version TEXT,
-                name_en TEXT,
-                name_en_AI TEXT,
-                name_de TEXT,
-                category_level_1 TEXT,
-                category_level_2 TEXT,
-                category_level_3 TEXT,
-                description_en TEXT,
-                description_en_AI TEXT,
-                description_de TEXT,
-                short_desc_en_AI TEXT,
-                reference_year TEXT,
-                valid_until TEXT,
-                time_repr_en TEXT,
-                time_repr_de TEXT,
-                safety_margin TEXT,
-                safety_descr_en TEXT,
-                safety_descr_de TEXT,
-                geo_location TEXT,
-                geo_descr_en TEXT,
-                geo_descr_de TEXT,
-                tech_descr_en TEXT,
-                tech_descr_en_AI TEXT,
-                tech_descr_de TEXT,
-                tech_applic_en TEXT,
-                tech_applic_en_AI TEXT,
-                tech_applic_de TEXT,
-                dataset_type TEXT,
-                dataset_subtype TEXT,
-                sources TEXT,
-                use_advice_en TEXT,
-                use_advice_de TEXT,
-                generator_en TEXT,
-                generator_de TEXT,
-                entry_by_en TEXT,
-                entry_by_de TEXT,
-                admin_version TEXT,
-                license_type TEXT,
-                access_en TEXT,
-                access_de TEXT,
-                timestamp TIMESTAMP,
-                formats TEXT,
-                original_epd_url TEXT,
-                datastock_id INTEGER,
-                FOREIGN KEY (datastock_id) REFERENCES DataStocks (datastock_id)
-            )
-        ''')
-        logger.info("Products table created successfully.")
-
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Compliances (
-                compliance_id SERIAL PRIMARY KEY,
-                process_id TEXT,
-                system_en TEXT,
-                system_de TEXT,
-                approval TEXT,
-                FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
-            )
-        ''')
-        logger.info("Compliances table created successfully.")
-
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Classifications (
-                process_id TEXT,
-                name TEXT,
-                level TEXT,
-                classId TEXT,
-                classification TEXT,
-                FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
-            )
-        ''')    
-        logger.info("Classifications table created successfully.")
-
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Exchanges (
-                exchange_id SERIAL PRIMARY KEY,
-                process_id TEXT,
-                flow_en TEXT,
-                flow_en_AI TEXT,
-                flow_de TEXT,
-                indicator_key TEXT,
-                direction TEXT,
-                meanAmount REAL,
-                unit TEXT,
-                FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
-            )
-        ''')
-        logger.info("Exchanges table created successfully.")
-
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Exchange_ModuleAmounts (
-                module_amount_id SERIAL PRIMARY KEY,
-                exchange_id INTEGER,
-                module TEXT,
-                scenario TEXT,
-                amount REAL,
-                FOREIGN KEY (exchange_id) REFERENCES Exchanges (exchange_id) ON DELETE CASCADE
-            )
-        ''')
-        logger.info("Exchange_ModuleAmounts table created successfully.")
-
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS LCIA_Results (
-                lcia_id SERIAL PRIMARY KEY,
-                process_id TEXT,
-                method_en TEXT,
-                method_en_AI TEXT,
-                method_de TEXT,
-                indicator_key TEXT,
-                meanAmount REAL,
-                unit TEXT,
-                FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
-            )
-        ''')
-        logger.info("LCIA_Results table created successfully.")
-
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS LCIA_ModuleAmounts (
-                lcia_module_amount_id SERIAL PRIMARY KEY,
-                lcia_id INTEGER,
-                module TEXT,
-                scenario TEXT,
-                amount REAL,
-                FOREIGN KEY (lcia_id) REFERENCES LCIA_Results (lcia_id) ON DELETE CASCADE
-            )
-        ''')
-        logger.info("LCIA_ModuleAmounts table created successfully.")
-
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Reviews (
-                review_id SERIAL PRIMARY KEY,
-                process_id TEXT,
-                reviewer TEXT,
-                detail_en TEXT,
-                detail_de TEXT,
-                FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
-            )
-        ''')
-        logger.info("Reviews table created successfully.")
+# Per-database session defaults applied in bulk mode, so every ingest connection
+# picks them up without touching postgresql.conf or restarting the server
+INGEST_DB_SETTINGS = {
+    'work_mem': '256MB',
+    'maintenance_work_mem': '1GB',
+    'synchronous_commit': 'off'
+}
 
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Flow_Properties (
-                flow_property_id SERIAL PRIMARY KEY,
-                process_id TEXT,
-                name_en TEXT,
-                name_en_AI TEXT,
-                name_de TEXT,
-                meanAmount TEXT,
-                unit TEXT,
-                is_reference BOOLEAN DEFAULT FALSE,
-                FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
-            )
-        ''')
-        logger.info("Flow_Properties table created successfully.")
+# Hash of the last successfully applied schema. It only skips work while the
+# database still has the tables, so dropping the database or schema is enough to re-run.
+SCHEMA_FINGERPRINT_FILE = f'{log_dir}/.schema_fingerprint'
 
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Material_Properties (
-                material_prop_id SERIAL PRIMARY KEY,
-                process_id TEXT,
-                property_id TEXT,
-                property_name TEXT,
-                value TEXT,
-                units TEXT,
-                description TEXT,
-                FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
-            )
-        ''')
-        logger.info("Material_Properties table created successfully.")
+# Connection pool for the target database, created on first use
+_pool = None
 
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Materials (
-                material_id SERIAL PRIMARY KEY,
-                process_id TEXT,
-                material TEXT,
-                list_order TEXT,
-                FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
-            )
-        ''')
-        logger.info("Materials table created successfully.")
+def get_pool():
+    """Return the connection pool for DB_NAME, creating it if needed."""
+    global _pool
+    if _pool is None:
+        _pool = ThreadedConnectionPool(1, 8, DB_DSN)
+    return _pool
 
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Uses (
-                use_id SERIAL PRIMARY KEY,
-                process_id TEXT,
-                use_case TEXT,
-                list_order TEXT,
-                FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
-            )
-        ''')
-        logger.info("Uses table created successfully.")
+def schema_present():
+    """Check that the target database exists and still contains the epd tables."""
+    try:
+        with closing(psycopg2.connect(DB_DSN)) as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT to_regclass('epd.products') IS NOT NULL")
+                return cur.fetchone()[0]
+    except psycopg2.OperationalError:
+        # The database itself does not exist (anymore)
+        return False
 
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Indicators (
-                indicator_key TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                short_description TEXT,
-                long_description TEXT
-            )
-        ''')
-        logger.info("Indicators table created successfully.")
+def create_database_and_tables():
+    """Creates the database and tables needed for the EPD data."""
 
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Modules (
-                module_code TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                short_description TEXT,
-                long_description TEXT
-            )
-        ''')
-        logger.info("Modules table created successfully.")
+    with open(SCHEMA_FILE, encoding="utf-8") as f:
+        schema_sql = f.read()
+    if BULK_LOAD:
+        schema_sql = schema_sql.replace("CREATE TABLE IF NOT EXISTS", "CREATE UNLOGGED TABLE IF NOT EXISTS")
+    # Include the target database so pointing .env at a new one re-applies the schema
+    target = f"{DB_PARAMS['host']}:{DB_PARAMS['port']}/{DB_NAME}"
+    fingerprint = hashlib.sha256(f"{target}\n{schema_sql}".encode()).hexdigest()
+
+    # Skip all database work if this exact schema has already been applied and is still there
+    if os.path.exists(SCHEMA_FINGERPRINT_FILE):
+        with open(SCHEMA_FINGERPRINT_FILE, encoding="utf-8") as f:
+            applied = f.read().strip() == fingerprint
+        if applied and schema_present():
+            logger.info("Schema unchanged since last run. Nothing to do.")
+            return
 
-        conn.commit()
-        logger.info("Tables created successfully.")
+    try:
+        # Connect to the PostgreSQL server (without specifying the database)
+        with closing(psycopg2.connect(SERVER_DSN)) as conn:
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT) #important for database creation
+
+            with conn.cursor() as cur:
+                # Create the database, treating an existing one as success
+                try:
+                    cur.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(DB_NAME)))
+                    logger.info("Database '%s' created successfully.", DB_NAME)
+                except DuplicateDatabase:
+                    logger.info("Database '%s' already exists.", DB_NAME)
+
+                # The tables live in the epd schema (see schema.sql); make them visible
+                # to every script by unqualified name
+                cur.execute(sql.SQL("ALTER DATABASE {} SET search_path TO epd, public").format(sql.Identifier(DB_NAME)))
+
+                if BULK_LOAD:
+                    cur.execute(sql.SQL("; ").join(
+                        sql.SQL("ALTER DATABASE {} SET {} = {}").format(
+                            sql.Identifier(DB_NAME), sql.SQL(name), sql.Literal(value))
+                        for name, value in INGEST_DB_SETTINGS.items()
+                    ))
+                    logger.info("Applied ingest settings to database '%s'.", DB_NAME)
+
+        # Get a connection to the newly created database from the pool
+        pool = get_pool()
+        conn = pool.getconn()
+        try:
+            # Run the whole schema in one transaction: one BEGIN, one COMMIT
+            conn.autocommit = False
+
+            # Create all tables in a single round trip
+            with conn.cursor() as cursor:
+                cursor.execute(schema_sql)
+
+            conn.commit()
+            logger.info("Schema created successfully.")
+
+            with open(SCHEMA_FINGERPRINT_FILE, "w", encoding="utf-8") as f:
+                f.write(fingerprint)
+        except psycopg2.Error:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            # Drop broken connections instead of handing them out again
+            pool.putconn(conn, close=bool(conn.closed))
 
     except psycopg2.Error as e:
-        error_msg = f"Error creating database or tables: {e}"
-        logger.error(error_msg)
-        print(f"ERROR: {error_msg}")  # Also print to console
-    finally:
-        if conn:
-            cursor.close()
-            conn.close()
+        logger.error("Error creating database or tables: %s", e)
 
 if __name__ == "__main__":
     create_database_and_tables()
\ No newline at end of file
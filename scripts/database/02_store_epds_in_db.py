@@ -1,14 +1,17 @@
 import os
-import json
-import psycopg2
-from psycopg2 import DatabaseError
+from psycopg2 import DatabaseError, errors, sql
+from psycopg2.pool import ThreadedConnectionPool
+import pandas as pd
 import logging
 from dotenv import load_dotenv
 import re
-import csv
-from datetime import datetime, timezone
+import sys
+import queue
 from tqdm import tqdm
 import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from helper_scripts.db_utils import bulk_insert, copy_rows
 
 # --- Load environment and configure logging ---
 load_dotenv()
@@ -17,7 +20,14 @@ os.makedirs(log_dir, exist_ok=True)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', filename=f'{log_dir}/store_epds_in_db.log')
 logger = logging.getLogger(__name__)
 
+# Imported after logging is configured: loading the translations logs at import time
+from parse_epd import parse_json, not_found_translations
+
 MAX_FILES = None  # Set to None to process all files
+BATCH_SIZE = 500  # Number of parsed EPDs sent to the database per batch
+PARSE_CHUNKSIZE = 32  # Number of files handed to a parser process at a time
+DB_WRITERS = 4  # Number of datastock folders written to the database concurrently
+DEADLOCK_RETRIES = 3  # Attempts per batch before falling back to storing its EPDs one by one
 # --- Database parameters ---
 DB_PARAMS = {
     'dbname': os.getenv("DB_NAME"),
@@ -27,335 +37,19 @@ DB_PARAMS = {
     'port': os.getenv("DB_PORT")
 }
 
-# --- Translation file path ---
-TRANSLATIONS_FILE = "./scripts/database/data/translations.csv"
-
-# Global list to track missing translations
-not_found_translations = []
-
-def load_translations(csv_file=TRANSLATIONS_FILE):
-    """Load translations from a CSV file."""
-    translations = {}
-    try:
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            for row in reader:
-                if len(row) >= 2:
-                    german = row[0].strip()
-                    english = row[1].strip()
-                    if german and english:
-                        translations[german.lower()] = english
-        logger.info(f"Loaded {len(translations)} translations.")
-    except FileNotFoundError:
-        logger.warning(f"Translation file {csv_file} not found.")
-    return translations
-
-
-def translate_text(text, translations):
-    """Translate text from German to English if a translation exists."""
-    if not text:
-        return text
-        
-    cleaned_text = text.replace(",", "").lower().strip()
-    if cleaned_text not in translations:
-        logger.debug(f"Warning: Translation for '{text}' not found.")
-        if text not in not_found_translations:
-            not_found_translations.append(text)
-        return text
-
-    return translations.get(cleaned_text)
-
-target_indicators = set([
-    "PERE", "PERM", "PERT", "PENRE", "PENRM", "PENRT", "SM", "RSF", "NRSF", "FW",
-    "HWD", "NHWD", "RWD", "CRU", "MFR", "MER", "EEE", "EET",
-    "GWP-total", "GWP-biogenic", "GWP-fossil", "GWP-luluc", "ODP", "POCP",
-    "AP", "EP-terrestrial", "EP-freshwater", "EP-marine", "WDP",
-    "ADPE", "ADPF", "HTP-c", "HTP-nc", "PM", "IR", "ETP-fw", "SQP"
-])
-
-def get_indicator_key(multilang_dict):
-    if not isinstance(multilang_dict, dict):
-        return None
-    for lang_text in multilang_dict.values():
-        for key in target_indicators:
-            if re.search(rf'\b{re.escape(key)}\b', lang_text, re.IGNORECASE):
-                return key
-    return None
-
-def extract_multilang(entry_list):
-    if not isinstance(entry_list, list):
-        return {}
-    return {entry.get("lang", "unknown"): entry.get("value") for entry in entry_list if isinstance(entry, dict)}
-
-def convert_timestamp(unix_timestamp):
-    """Convert Unix timestamp (in milliseconds) to ISO 8601 format."""
-    if not unix_timestamp:
-        return None
-    try:
-        # Convert milliseconds to seconds
-        timestamp_in_seconds = int(unix_timestamp) / 1000
-        # Convert to datetime object
-        dt = datetime.fromtimestamp(timestamp_in_seconds, tz=timezone.utc)
-        # Format as ISO 8601 with timezone info
-        return dt.isoformat()
-    except (ValueError, TypeError):
-        logger.warning(f"Failed to convert timestamp: {unix_timestamp}")
-        return None
-
-def extract_original_epd_url(data):
-    """Extract the original EPD URL from the JSON data."""
-    try:
-        original_epd = data.get("modellingAndValidation", {}).get("dataSourcesTreatmentAndRepresentativeness", {}).get("other", {}).get("anies", [])
-        for item in original_epd:
-            if item.get("name") == "referenceToOriginalEPD":
-                value = item.get("value", {})
-                resource_urls = value.get("resourceURLs", [])
-                if resource_urls:
-                    return resource_urls[0]
-    except (KeyError, TypeError) as e:
-        logger.warning(f"Failed to extract original EPD URL: {e}")
-    return None
-    
-def parse_json(json_path, translations):
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    uuid = data.get("processInformation", {}).get("dataSetInformation", {}).get("UUID", "")
-    version = data.get("administrativeInformation", {}).get("publicationAndOwnership", {}).get("dataSetVersion", "")
-    process_id = f"{uuid}_{version}"
-
-    name = extract_multilang(data["processInformation"]["dataSetInformation"].get("name", {}).get("baseName", []))
-    comment = extract_multilang(data["processInformation"]["dataSetInformation"].get("generalComment", []))
-    reference_year = data["processInformation"].get("time", {}).get("referenceYear")
-    valid_until = data["processInformation"].get("time", {}).get("dataSetValidUntil")
-    time_representativeness = {}
-
-    safety_margins = {
-        'margin': None,
-        'description': {}
-    }
-
-    geo = data["processInformation"].get("geography", {}).get("locationOfOperationSupplyOrProduction", {})
-    geography = {
-        'location': geo.get("location"),
-        'description': {}
-    }
-
-    tech = data["processInformation"].get("technology", {})
-    technology_description = extract_multilang(tech.get("technologyDescriptionAndIncludedProcesses", []))
-    tech_applicability = extract_multilang(tech.get("technologicalApplicability", []))
-
-    method_info = data["modellingAndValidation"].get("LCIMethodAndAllocation", {})
-    dataset_type = method_info.get("typeOfDataSet")
-    dataset_subtype = next((el["value"] for el in method_info.get("other", {}).get("anies", []) if el.get("name") == "subType"), None)
-
-    sources = ', '.join(
-        el["shortDescription"][0]["value"]
-        for el in data["modellingAndValidation"].get("dataSourcesTreatmentAndRepresentativeness", {}).get("referenceToDataSource", [])
-        if el.get("shortDescription")
-    )
-
-    use_advice = extract_multilang(data["modellingAndValidation"].get("dataSourcesTreatmentAndRepresentativeness", {}).get("useAdviceForDataSet", []))
-
-    original_epd_url = extract_original_epd_url(data)
-
-    reviews = []
-    for r in data["modellingAndValidation"].get("validation", {}).get("review", []):
-        reviewers = [e["shortDescription"][0]["value"] for e in r.get("referenceToNameOfReviewerAndInstitution", []) if e.get("shortDescription")]
-        reviews.append({"reviewers": reviewers, "details": {}})
-
-    compliances = []
-    for c in data["modellingAndValidation"].get("complianceDeclarations", {}).get("compliance", []):
-        short = c.get("referenceToComplianceSystem", {}).get("shortDescription", [])
-        system = extract_multilang(short)
-        compliances.append({"system": system, "approval": None})
-
-    admin = data.get("administrativeInformation", {})
-    entry = admin.get("dataEntryBy", {})
-    admin_info = {
-        'generator': extract_multilang(admin.get("dataGenerator", {}).get("referenceToPersonOrEntityGeneratingTheDataSet", [{}])[0].get("shortDescription", [])),
-        'entry_by': extract_multilang(entry.get("referenceToDataSetFormat", [{}])[0].get("shortDescription", [])),
-        'timestamp': convert_timestamp(entry.get("timeStamp")),
-        'formats': [
-                    next((desc.get("value") for desc in fmt.get("shortDescription", []) if isinstance(desc, dict) and "value" in desc), None)
-                    for fmt in entry.get("referenceToDataSetFormat", [])
-                    ],
-        'version': admin.get("publicationAndOwnership", {}).get("dataSetVersion"),
-        'license': admin.get("publicationAndOwnership", {}).get("licenseType"),
-        'access': extract_multilang(admin.get("publicationAndOwnership", {}).get("accessRestrictions", []))
-    }
-
-    classifications = []
-    for c in data["processInformation"]["dataSetInformation"].get("classificationInformation", {}).get("classification", []):
-        for cl in c.get("class", []):
-            classifications.append({
-                "name": c.get("name"),
-                "level": cl.get("level", ""),
-                "classId": cl.get("classId", ""),
-                "classification": cl.get("value")
-            })
-
-    exchanges = []
-    for ex in data.get("exchanges", {}).get("exchange", []):
-        flow = extract_multilang(ex.get("referenceToFlowDataSet", {}).get("shortDescription", []))
-        indicator_key = get_indicator_key(flow)
-        direction = ex.get("exchange direction")
-        meanAmount = ex.get("meanAmount")
-        unit = None
-        for item in ex.get("other", {}).get("anies", []):
-            if item.get("name") == "referenceToUnitGroupDataSet":
-                unit_value = item.get("value")
-                if isinstance(unit_value, dict) and "shortDescription" in unit_value:
-                    for desc in unit_value.get("shortDescription", []):
-                        if isinstance(desc, dict) and "value" in desc:
-                            unit = desc.get("value")
-                            break
-        module_amounts = {}
-        for x in ex.get("other", {}).get("anies", []):
-            if "module" in x:
-                # If value doesn't exist or is empty, use None
-                if "value" not in x or x["value"] == "":
-                    amount = None
-                else:
-                    try:
-                        amount = float(x["value"])
-                    except (ValueError, TypeError):
-                        amount = None
-                
-                module_amounts[x.get("module")] = {
-                    "amount": amount, 
-                    "scenario": x.get("scenario", "")
-                }
-        exchanges.append({
-            'data_set_internal_id': ex.get("dataSetInternalID"),
-            'reference_to_flow': None,
-            'uri': ex.get("referenceToFlowDataSet", {}).get("uri"),
-            'ref_object_id': ex.get("referenceToFlowDataSet", {}).get("refObjectId"),
-            'flow': flow,
-            'indicator_key': indicator_key,
-            'direction': direction,
-            'meanAmount': meanAmount,
-            'unit': unit,
-            'module_amounts': module_amounts
-        })
-
-    lcia_results = []
-    for lcia in data.get("LCIAResults", {}).get("LCIAResult", []):
-        method = extract_multilang(lcia.get("referenceToLCIAMethodDataSet", {}).get("shortDescription", []))
-        indicator_key = get_indicator_key(method)
-        meanAmount = lcia.get("meanAmount")
-        unit = None
-        for item in lcia.get("other", {}).get("anies", []):
-            if item.get("name") == "referenceToUnitGroupDataSet":
-                unit_value = item.get("value")
-                if isinstance(unit_value, dict) and "shortDescription" in unit_value:
-                    for desc in unit_value.get("shortDescription", []):
-                        if isinstance(desc, dict) and "value" in desc:
-                            unit = desc.get("value")
-                            break
-        module_amounts = {}
-        for x in lcia.get("other", {}).get("anies", []):
-            if "module" in x:
-                # If value doesn't exist or is empty, use None
-                if "value" not in x or x["value"] == "":
-                    amount = None
-                else:
-                    try:
-                        amount = float(x["value"])
-                    except (ValueError, TypeError):
-                        amount = None
-                
-                module_amounts[x.get("module")] = {
-                    "amount": amount,
-                    "scenario": x.get("scenario", "")
-                }
-
-        lcia_results.append({
-            'method': method,
-            'indicator_key': indicator_key,
-            'meanAmount': meanAmount,
-            'unit': unit,
-            'module_amounts': module_amounts
-        })
-
-    reference_flow_id = data["processInformation"]["quantitativeReference"]["referenceToReferenceFlow"][0]
-    reference_flow = []
-    for ex in data.get("exchanges", {}).get("exchange", []):
-        if ex.get("dataSetInternalID") == reference_flow_id:
-            mat_props = ex.get("materialProperties", [])
-            flow_props = ex.get("flowProperties", [])
-            ref_flow_props = []
-            for prop in flow_props:
-                ref_flow_props.append({
-                    "name_en": next((n["value"] for n in prop.get("name", []) if n.get("lang") == "en"), None),
-                    "name_de": next((n["value"] for n in prop.get("name", []) if n.get("lang") == "de"), None),
-                    "mean_value": prop.get("meanValue"),
-                    "unit": prop.get("referenceUnit"),
-                    "is_reference": prop.get("referenceFlowProperty", False),
-                    "dataSetInternalID": prop.get("uuid")
-                })
-            reference_flow.append({
-                'material_properties': {mp['name']: {
-                    'value': mp['value'],
-                    'units': mp['unit'],
-                    'description': mp.get('unitDescription')
-                } for mp in mat_props},
-                'flow_properties': ref_flow_props
-            })
-
-    # Extract categories
-    category_level_1 = None
-    category_level_2 = None
-    category_level_3 = None
-    
-    for classification in classifications:
-        if classification.get("name").lower() == "oekobau.dat":
-            classes = [c for c in classifications if c.get("name").lower() == "oekobau.dat"]
-            for c in classes:
-                level = int(c.get("level", "0"))
-                classification_value = c.get("classification")
-                # Translate the classification value
-                translated_classification = translate_text(classification_value, translations)
-                if level == 0:
-                    category_level_1 = translated_classification
-                elif level == 1:
-                    category_level_2 = translated_classification
-                elif level == 2:
-                    category_level_3 = translated_classification
-
-    return {
-        'process_id': process_id,
-        'uuid': uuid,
-        'version': version,
-        'name': name,
-        'description': comment,
-        'category_level_1': category_level_1,
-        'category_level_2': category_level_2,
-        'category_level_3': category_level_3,
-        'classifications': classifications,
-        'reference_year': reference_year,
-        'valid_until': valid_until,
-        'time_representativeness': time_representativeness,
-        'safety_margins': safety_margins,
-        'geography': geography,
-        'technology_description': technology_description,
-        'tech_applicability': tech_applicability,
-        'dataset_type': dataset_type,
-        'dataset_subtype': dataset_subtype,
-        'sources': sources,
-        'use_advice': use_advice,
-        'reviews': reviews,
-        'compliances': compliances,
-        'admin_info': admin_info,
-        'exchanges': exchanges,
-        'lcia_results': lcia_results,
-        'reference_flow': reference_flow,
-        'original_epd_url': original_epd_url
-    }
-
-def connect_to_db():
+# --- Bulk load mode (see 01_create_database.py) ---
+BULK_LOAD = os.getenv("LOAD_MODE") == "bulk"
+# Parents before children: a logged table may not reference an unlogged one
+SCHEMA_TABLES = [
+    "DataStocks", "Products", "Exchanges", "LCIA_Results",
+    "Compliances", "Classifications", "Exchange_ModuleAmounts", "LCIA_ModuleAmounts",
+    "Reviews", "Flow_Properties", "Material_Properties", "Materials", "Uses",
+    "Indicators", "Modules"
+]
+
+def create_connection_pool():
     try:
-        return psycopg2.connect(**DB_PARAMS)
+        return ThreadedConnectionPool(2, 8, **DB_PARAMS)
     except Exception as e:
         logger.error(f"Database connection error: {e}")
         raise
@@ -380,200 +74,345 @@ def get_or_create_datastock(conn, datastock_name, datastock_uuid):
     """Get existing datastock ID or create a new one."""
     try:
         with conn.cursor() as cursor:
-            # Check if the datastock exists
-            cursor.execute('''
-                SELECT datastock_id FROM DataStocks WHERE uuid = %s
-            ''', (datastock_uuid,))
-            result = cursor.fetchone()
-            
-            if result:
-                return result[0]
-            
-            # Create new datastock
+            # Create the datastock; RETURNING yields nothing if the uuid already exists
             cursor.execute('''
                 INSERT INTO DataStocks (name, uuid)
                 VALUES (%s, %s)
+                ON CONFLICT (uuid) DO NOTHING
                 RETURNING datastock_id
             ''', (datastock_name, datastock_uuid))
-            datastock_id = cursor.fetchone()[0]
-            conn.commit()
-            
-            logger.info(f"Created new datastock: {datastock_name} (ID: {datastock_id})")
-            return datastock_id
+            result = cursor.fetchone()
+
+            if result:
+                datastock_id = result[0]
+                conn.commit()
+                logger.info(f"Created new datastock: {datastock_name} (ID: {datastock_id})")
+                return datastock_id
+
+            # Datastock already exists
+            cursor.execute('''
+                SELECT datastock_id FROM DataStocks WHERE uuid = %s
+            ''', (datastock_uuid,))
+            return cursor.fetchone()[0]
     except Exception as e:
         conn.rollback()
         logger.error(f"Error creating datastock: {e}")
         return None
 
-def store_data_in_db(collected_data, conn, datastock_id):
-    with conn.cursor() as cursor:
-        for item in collected_data:
-            # Check if the product with the given process_id already exists
-            cursor.execute('''
-                SELECT 1 FROM products WHERE process_id = %s
-            ''', (item['process_id'],))
-            exists = cursor.fetchone()
-
-            if exists:
-                logger.info(f"Product with process_id {item['process_id']} already exists. Skipping insertion.")
-                continue
+PRODUCT_COLUMNS = [
+    "process_id", "uuid", "version", "name_de", "name_en",
+    "category_level_1", "category_level_2", "category_level_3",
+    "description_de", "description_en", "reference_year",
+    "valid_until", "time_repr_de", "time_repr_en", "safety_margin", "safety_descr_de", "safety_descr_en",
+    "geo_location", "geo_descr_de", "geo_descr_en",
+    "tech_descr_de", "tech_descr_en", "tech_applic_de", "tech_applic_en",
+    "dataset_type", "dataset_subtype", "sources",
+    "use_advice_de", "use_advice_en",
+    "generator_de", "generator_en", "entry_by_de", "entry_by_en",
+    "admin_version", "license_type", "access_de", "access_en",
+    "timestamp", "formats", "original_epd_url", "datastock_id"
+]
+
+# Timestamps arrive as epoch milliseconds and are converted server-side to UTC wall time
+PRODUCT_TEMPLATE = "(" + ", ".join(
+    "TO_TIMESTAMP(%s / 1000.0) AT TIME ZONE 'UTC'" if col == "timestamp" else "%s"
+    for col in PRODUCT_COLUMNS
+) + ")"
+
+def product_row(item):
+    """Flatten a parsed EPD into a row matching PRODUCT_COLUMNS, without the datastock_id."""
+    return (
+        item['process_id'], item['uuid'], item['version'],
+        item['name'].get('de'), item['name'].get('en'),
+        item['category_level_1'], item['category_level_2'], item['category_level_3'],
+        item['description'].get('de'), item['description'].get('en'),
+        item['reference_year'], item['valid_until'],
+        item['time_representativeness'].get('de'), item['time_representativeness'].get('en'),
+        item['safety_margins']['margin'],
+        item['safety_margins']['description'].get('de'), item['safety_margins']['description'].get('en'),
+        item['geography']['location'],
+        item['geography']['description'].get('de'), item['geography']['description'].get('en'),
+        item['technology_description'].get('de'), item['technology_description'].get('en'),
+        item['tech_applicability'].get('de'), item['tech_applicability'].get('en'),
+        item['dataset_type'], item['dataset_subtype'], item['sources'],
+        item['use_advice'].get('de'), item['use_advice'].get('en'),
+        item['admin_info']['generator'].get('de'), item['admin_info']['generator'].get('en'),
+        item['admin_info']['entry_by'].get('de'), item['admin_info']['entry_by'].get('en'),
+        item['admin_info']['version'], item['admin_info']['license'],
+        item['admin_info']['access'].get('de'), item['admin_info']['access'].get('en'),
+        item['admin_info']['timestamp'],
+        ', '.join(filter(None, item['admin_info']['formats'])),  # Filter None values
+        item['original_epd_url']
+    )
 
-            # Insert the product if it does not exist
-            cursor.execute('''
-                INSERT INTO products (
-                    process_id, uuid, version, name_de, name_en, 
-                    category_level_1, category_level_2, category_level_3,
-                    description_de, description_en, reference_year,
-                    valid_until, time_repr_de, time_repr_en, safety_margin, safety_descr_de, safety_descr_en,
-                    geo_location, geo_descr_de, geo_descr_en,
-                    tech_descr_de, tech_descr_en, tech_applic_de, tech_applic_en,
-                    dataset_type, dataset_subtype, sources,
-                    use_advice_de, use_advice_en,
-                    generator_de, generator_en, entry_by_de, entry_by_en,
-                    admin_version, license_type, access_de, access_en,
-                    timestamp, formats, original_epd_url, datastock_id
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                          %s, %s, %s, %s, %s, %s,
-                          %s, %s, %s,
-                          %s, %s, %s, %s, 
-                          %s, %s, %s,
-                          %s, %s,
-                          %s, %s, %s, %s,
-                          %s, %s, %s, %s,
-                          %s, %s, %s, %s)
-            ''', (
-                item['process_id'], item['uuid'], item['version'],
-                item['name'].get('de'), item['name'].get('en'),
-                item['category_level_1'], item['category_level_2'], item['category_level_3'],
-                item['description'].get('de'), item['description'].get('en'),
-                item['reference_year'], item['valid_until'],
-                item['time_representativeness'].get('de'), item['time_representativeness'].get('en'),
-                item['safety_margins']['margin'],
-                item['safety_margins']['description'].get('de'), item['safety_margins']['description'].get('en'),
-                item['geography']['location'],
-                item['geography']['description'].get('de'), item['geography']['description'].get('en'),
-                item['technology_description'].get('de'), item['technology_description'].get('en'),
-                item['tech_applicability'].get('de'), item['tech_applicability'].get('en'),
-                item['dataset_type'], item['dataset_subtype'], item['sources'],
-                item['use_advice'].get('de'), item['use_advice'].get('en'),
-                item['admin_info']['generator'].get('de'), item['admin_info']['generator'].get('en'),
-                item['admin_info']['entry_by'].get('de'), item['admin_info']['entry_by'].get('en'),
-                item['admin_info']['version'], item['admin_info']['license'],
-                item['admin_info']['access'].get('de'), item['admin_info']['access'].get('en'),
-                item['admin_info']['timestamp'],
-                ', '.join(filter(None, item['admin_info']['formats'])),  # Filter None values
-                item['original_epd_url'],
-                datastock_id
+class EpdBatch:
+    """A batch of parsed EPDs, flattened into rows per table.
+
+    Every row starts with its process_id. The other tables stay row tuples because
+    execute_values and COPY consume rows. Module amounts are stored column-wise,
+    one list per column, with *_index pointing at the owning row in exchanges or
+    lcia_results; this lets whole columns be transformed at once before insert.
+    """
+
+    def __init__(self):
+        self.process_ids = set()
+        self.items = []  # Kept so a failed batch can be retried one EPD at a time
+        self.products = []
+        self.classifications = []
+        self.exchanges = []
+        self.exchange_module_index = []
+        self.exchange_module_names = []
+        self.exchange_module_scenarios = []
+        self.exchange_module_amounts = []
+        self.lcia_results = []
+        self.lcia_module_index = []
+        self.lcia_module_names = []
+        self.lcia_module_scenarios = []
+        self.lcia_module_amounts = []
+        self.reviews = []
+        self.compliances = []
+        self.flow_properties = []
+        self.material_properties = []
+
+    def __len__(self):
+        return len(self.products)
+
+    def add(self, item):
+        """Append one parsed EPD; repeats of a process_id within the batch are ignored."""
+        process_id = item['process_id']
+        if process_id in self.process_ids:
+            return
+        self.process_ids.add(process_id)
+        self.items.append(item)
+        self.products.append(product_row(item))
+
+        for classification in item['classifications']:
+            self.classifications.append((
+                process_id, classification['name'], classification['level'],
+                classification['classId'], classification['classification']
             ))
 
-            # Insert related data (e.g., classifications, exchanges, LCIA results, reviews, compliances)
-            for classification in item['classifications']:
-                cursor.execute('''
-                    INSERT INTO classifications (process_id, name, level, classId, classification)
-                    VALUES (%s, %s, %s, %s, %s)
-                ''', (item['process_id'], classification['name'], classification['level'], classification['classId'], classification['classification']))
-
-            for exchange in item['exchanges']:
-                cursor.execute('''
-                    INSERT INTO exchanges (process_id, flow_de, flow_en, indicator_key, direction, meanAmount, unit)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    RETURNING exchange_id
-                ''', (
-                    item['process_id'],
-                    exchange['flow'].get('de'),
-                    exchange['flow'].get('en'),
-                    exchange['indicator_key'],
-                    exchange['direction'],
-                    exchange['meanAmount'],
-                    exchange['unit']
+        for exchange in item['exchanges']:
+            index = len(self.exchanges)
+            self.exchanges.append((
+                process_id,
+                exchange['flow'].get('de'),
+                exchange['flow'].get('en'),
+                exchange['indicator_key'],
+                exchange['direction'],
+                exchange['meanAmount'],
+                exchange['unit']
+            ))
+            for module, data in exchange['module_amounts'].items():
+                self.exchange_module_index.append(index)
+                self.exchange_module_names.append(module)
+                self.exchange_module_scenarios.append(data['scenario'])
+                self.exchange_module_amounts.append(data['amount'])
+
+        for lcia in item['lcia_results']:
+            index = len(self.lcia_results)
+            self.lcia_results.append((
+                process_id,
+                lcia['method'].get('de'),
+                lcia['method'].get('en'),
+                lcia['indicator_key'],
+                lcia['meanAmount'],
+                lcia['unit']
+            ))
+            for module, data in lcia['module_amounts'].items():
+                self.lcia_module_index.append(index)
+                self.lcia_module_names.append(module)
+                self.lcia_module_scenarios.append(data['scenario'])
+                self.lcia_module_amounts.append(data['amount'])
+
+        for review in item['reviews']:
+            for reviewer in review['reviewers']:
+                self.reviews.append((
+                    process_id, reviewer,
+                    review['details'].get('de'), review['details'].get('en')
                 ))
-                exchange_id = cursor.fetchone()[0]
-
-                for module, data in exchange['module_amounts'].items():
-                   scenario = data['scenario']
-                   amount = data['amount']
-                   cursor.execute('''
-                       INSERT INTO exchange_moduleamounts (exchange_id, module, scenario, amount)
-                       VALUES (%s, %s, %s, %s)
-                   ''', (exchange_id, module, scenario, amount))
-
-            for lcia in item['lcia_results']:
-                cursor.execute('''
-                    INSERT INTO lcia_results (process_id, method_de, method_en, indicator_key, meanAmount, unit)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    RETURNING lcia_id
-                ''', (
-                    item['process_id'],
-                    lcia['method'].get('de'),
-                    lcia['method'].get('en'),
-                    lcia['indicator_key'],
-                    lcia['meanAmount'],
-                    lcia['unit']
+
+        for compliance in item['compliances']:
+            self.compliances.append((
+                process_id,
+                compliance['system'].get('de'), compliance['system'].get('en'),
+                compliance['approval']
+            ))
+
+        for refFlow in item['reference_flow']:
+            for flow_property in refFlow['flow_properties']:
+                self.flow_properties.append((
+                    process_id,
+                    flow_property.get('name_en'),
+                    flow_property.get('name_de'),
+                    flow_property.get('mean_value'),
+                    flow_property.get('unit'),
+                    flow_property.get('is_reference', False)
                 ))
-                lcia_id = cursor.fetchone()[0]
-
-                for module, data in lcia['module_amounts'].items():
-                    scenario = data['scenario']
-                    amount = data['amount']
-                    cursor.execute('''
-                        INSERT INTO lcia_moduleamounts (lcia_id, module, scenario, amount)
-                        VALUES (%s, %s, %s, %s)
-                    ''', (lcia_id, module, scenario, amount))
-
-            for review in item['reviews']:
-                for reviewer in review['reviewers']:
-                    cursor.execute('''
-                        INSERT INTO reviews (process_id, reviewer, detail_de, detail_en)
-                        VALUES (%s, %s, %s, %s)
-                    ''', (
-                        item['process_id'], reviewer,
-                        review['details'].get('de'), review['details'].get('en')
-                    ))
-
-            for compliance in item['compliances']:
-                cursor.execute('''
-                    INSERT INTO compliances (process_id, system_de, system_en, approval)
-                    VALUES (%s, %s, %s, %s)
-                ''', (
-                    item['process_id'],
-                    compliance['system'].get('de'), compliance['system'].get('en'),
-                    compliance['approval']
+
+            for property_id, property_data in refFlow['material_properties'].items():
+                self.material_properties.append((
+                    process_id,
+                    property_id,
+                    property_data.get('name'),
+                    convert_to_float(property_data.get('value')),
+                    property_data.get('units'),
+                    property_data.get('description')
                 ))
 
-            for refFlow in item['reference_flow']:
-
-                # Insert the reference flow properties 
-                for flow_property in refFlow['flow_properties']:
-                    cursor.execute('''
-                        INSERT INTO flow_properties (process_id, name_en, name_de, meanamount, unit, is_reference)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                    ''', (
-                        item['process_id'],
-                        flow_property.get('name_en'),
-                        flow_property.get('name_de'),
-                        flow_property.get('mean_value'),
-                        flow_property.get('unit'),
-                        flow_property.get('is_reference', False)
-                    ))
-
-                # Insert the material properties 
-                for property_id, property_data in refFlow['material_properties'].items():
-                    cursor.execute('''
-                        INSERT INTO material_properties (process_id, property_id, property_name, value, units, description)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                    ''', (
-                        item['process_id'],
-                        property_id,
-                        property_data.get('name'),
-                        convert_to_float(property_data.get('value')),
-                        property_data.get('units'),
-                        property_data.get('description')
-                    ))
-                    
-        conn.commit()
-
-def process_datastock_folder(data_dir, folder_name, conn, translations):
-    """Process all JSON files in a datastock folder."""
+def to_float_column(values):
+    """Convert a column of raw amounts to floats in one pass; missing or invalid values become None."""
+    if not values:
+        return []
+    numbers = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=float)
+    return [None if value != value else value for value in numbers.tolist()]  # NaN -> NULL
+
+def insert_with_module_amounts(cursor, table, columns, id_column, rows, new_ids,
+                               module_table, module_id_column, index, names, scenarios, amounts):
+    """Insert parent rows of new products, then their module amounts keyed by the generated ids."""
+    kept = [i for i, row in enumerate(rows) if row[0] in new_ids]
+    # RETURNING yields ids in VALUES order, so they line up with the kept row positions
+    returned = bulk_insert(cursor, table, columns, [rows[i] for i in kept], returning=[id_column])
+    id_by_index = {i: row_id for i, (row_id,) in zip(kept, returned)}
+    copy_rows(cursor, module_table, [module_id_column, "module", "scenario", "amount"], [
+        (id_by_index[i], module, scenario, amount)
+        for i, module, scenario, amount in zip(index, names, scenarios, to_float_column(amounts))
+        if i in id_by_index
+    ])
+
+def store_data_in_db(batch, conn, datastock_id):
+    """Insert an EpdBatch with one multi-row INSERT or COPY per table.
+
+    Products that already exist are skipped via ON CONFLICT, together with their
+    related rows. Returns the number of newly inserted products. The caller is
+    responsible for committing.
+    """
+    with conn.cursor() as cursor:
+        # Sorted so concurrent writers lock shared process_ids in the same order
+        inserted = bulk_insert(
+            cursor, "products", PRODUCT_COLUMNS,
+            sorted((row + (datastock_id,) for row in batch.products), key=lambda row: row[0]),
+            returning=["process_id"], on_conflict_do_nothing=True, template=PRODUCT_TEMPLATE
+        )
+        new_ids = {row[0] for row in inserted}
+        skipped = len(batch) - len(new_ids)
+        if skipped:
+            logger.info(f"{skipped} products already exist. Skipping insertion.")
+
+        def new_rows(rows):
+            return [row for row in rows if row[0] in new_ids]
+
+        bulk_insert(cursor, "classifications", ["process_id", "name", "level", "classId", "classification"],
+                    new_rows(batch.classifications), on_conflict_do_nothing=True)
+
+        insert_with_module_amounts(
+            cursor, "exchanges",
+            ["process_id", "flow_de", "flow_en", "indicator_key", "direction", "meanAmount", "unit"],
+            "exchange_id", batch.exchanges, new_ids, "exchange_moduleamounts", "exchange_id",
+            batch.exchange_module_index, batch.exchange_module_names,
+            batch.exchange_module_scenarios, batch.exchange_module_amounts
+        )
+        insert_with_module_amounts(
+            cursor, "lcia_results",
+            ["process_id", "method_de", "method_en", "indicator_key", "meanAmount", "unit"],
+            "lcia_id", batch.lcia_results, new_ids, "lcia_moduleamounts", "lcia_id",
+            batch.lcia_module_index, batch.lcia_module_names,
+            batch.lcia_module_scenarios, batch.lcia_module_amounts
+        )
+
+        # Rows without conflicts or generated ids to read back are streamed with COPY
+        copy_rows(cursor, "reviews", ["process_id", "reviewer", "detail_de", "detail_en"],
+                  new_rows(batch.reviews))
+        copy_rows(cursor, "compliances", ["process_id", "system_de", "system_en", "approval"],
+                  new_rows(batch.compliances))
+        copy_rows(cursor, "flow_properties",
+                  ["process_id", "name_en", "name_de", "meanamount", "unit", "is_reference"],
+                  new_rows(batch.flow_properties))
+        copy_rows(cursor, "material_properties",
+                  ["process_id", "property_id", "property_name", "value", "units", "description"],
+                  new_rows(batch.material_properties))
+    return len(new_ids)
+
+def flush_batch(batch, conn, datastock_id):
+    """Store and commit one EpdBatch, returning the number of newly inserted products.
+
+    A batch that loses a deadlock against another writer is retried as a whole.
+    If it fails otherwise, it is rolled back and its EPDs are retried one at a
+    time inside a savepoint, so only the EPDs that fail themselves are skipped.
+    """
+    for attempt in range(1, DEADLOCK_RETRIES + 1):
+        try:
+            stored = store_data_in_db(batch, conn, datastock_id)
+            conn.commit()
+            return stored
+        except errors.DeadlockDetected as e:
+            conn.rollback()
+            logger.warning(f"Deadlock while storing a batch (attempt {attempt} of {DEADLOCK_RETRIES}): {e}")
+        except DatabaseError as e:
+            conn.rollback()
+            logger.warning(f"Storing a batch of {len(batch)} EPDs failed, retrying one by one: {e}")
+            break
+
+    stored = 0
+    for item in batch.items:
+        single = EpdBatch()
+        single.add(item)
+        with conn.cursor() as cursor:
+            cursor.execute("SAVEPOINT store_epd")
+            try:
+                stored += store_data_in_db(single, conn, datastock_id)
+                cursor.execute("RELEASE SAVEPOINT store_epd")
+            except DatabaseError as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT store_epd")
+                logger.error(f"Skipping EPD {item['process_id']}: {e}")
+    conn.commit()
+    return stored
+
+def finish_bulk_load(conn):
+    """Make the database crash-safe again after a bulk load.
+
+    Turns the UNLOGGED tables into regular ones and restores synchronous commits,
+    which 01_create_database.py switched off for the ingest.
+    """
+    with conn.cursor() as cursor:
+        for table in SCHEMA_TABLES:
+            cursor.execute(f"ALTER TABLE {table} SET LOGGED")
+        cursor.execute(sql.SQL("ALTER DATABASE {} RESET synchronous_commit").format(sql.Identifier(DB_PARAMS['dbname'])))
+    conn.commit()
+    logger.info("All tables set to LOGGED after bulk load.")
+
+def parse_file(json_path):
+    """Parse one EPD file in a worker process.
+
+    Returns (item_data, missing_translations, error_traceback). Missing translations
+    are returned because the worker's not_found_translations is not shared with the parent.
+    """
+    not_found_translations.clear()
+    try:
+        item_data = parse_json(json_path)
+    except Exception:
+        return None, set(not_found_translations), traceback.format_exc()
+    return item_data, set(not_found_translations), None
+
+def parse_in_windows(executor, json_paths):
+    """Yield (json_path, parse_file result) in order, parsing at most two windows of BATCH_SIZE files ahead.
+
+    executor.map submits all of its input at once, so mapping a whole folder would let
+    parsed EPDs pile up in memory whenever the database is slower than the parsers.
+    The next window is submitted before the current one is consumed to keep the parsers busy.
+    """
+    pending = None
+    for start in range(0, len(json_paths), BATCH_SIZE):
+        window = json_paths[start:start + BATCH_SIZE]
+        results = zip(window, executor.map(parse_file, window, chunksize=PARSE_CHUNKSIZE))
+        if pending is not None:
+            yield from pending
+        pending = results
+    if pending is not None:
+        yield from pending
+
+def process_datastock_folder(data_dir, folder_name, conn, executor, position=0):
+    """Process all JSON files in a datastock folder; position is the line of its progress bar."""
     folder_path = os.path.join(data_dir, folder_name)
     
     # Extract datastock information
@@ -589,65 +428,99 @@ def process_datastock_folder(data_dir, folder_name, conn, translations):
         return 0
     
     # Get all JSON files in the directory
-    json_files = [f for f in os.listdir(folder_path) if f.endswith(".json")]
-    file_count = 0
-    
-    total_files = len(json_files) if MAX_FILES is None else min(len(json_files), MAX_FILES)
-    
-    for file_name in tqdm(json_files, desc=f"Processing EPD files in {folder_name}", total=total_files):
-        if MAX_FILES is not None and file_count >= MAX_FILES:
-            logger.info(f"Processed {MAX_FILES} files. Stopping for folder {folder_name}.")
-            break
-            
-        json_path = os.path.join(folder_path, file_name)
-        logger.info(f"Processing file: {json_path}")
-            
-        try:
-            # Pass translations dictionary to parse_json
-            item_data = parse_json(json_path, translations)
+    with os.scandir(folder_path) as it:
+        json_files = [e.name for e in it if e.is_file() and e.name.endswith(".json")]
+    if MAX_FILES is not None:
+        json_files = json_files[:MAX_FILES]
+    total_files = len(json_files)
+
+    # Parse files in parallel worker processes; one bad file does not affect the others.
+    # Results arrive in order and are stored in batches, each in its own transaction.
+    json_paths = [os.path.join(folder_path, file_name) for file_name in json_files]
+    batch = EpdBatch()
+    stored_count = 0
+    try:
+        progress = tqdm(
+            parse_in_windows(executor, json_paths), desc=f"Processing EPD files in {folder_name}", total=total_files,
+            mininterval=1.0, miniters=max(1, total_files // 200), disable=not sys.stderr.isatty(),
+            position=position, leave=False
+        )
+        for json_path, (item_data, missing, error) in progress:
+            logger.debug("Processing file: %s", json_path)
+            not_found_translations.update(missing)
+
+            if error:
+                logger.error(f"Failed to parse {os.path.basename(json_path)}:\n{error}")
+                continue
+
             if item_data:
-                try:
-                    store_data_in_db([item_data], conn, datastock_id)
-                    logger.info(f"Data from {file_name} stored successfully.")
-                    file_count += 1
-                except Exception as store_error:
-                    logger.error(f"Failed to store data from {file_name}: {store_error}")
-                    logger.error(traceback.format_exc())
-                    conn.rollback() 
-        except Exception as parse_error:
-            logger.error(f"Failed to parse {file_name}: {parse_error}")
-            logger.error(traceback.format_exc())
-
-    logger.info(f"Processing complete for folder {folder_name}. Successfully processed {file_count} out of {len(json_files)} files.")
-    return file_count
+                batch.add(item_data)
+            if len(batch) >= BATCH_SIZE:
+                stored_count += flush_batch(batch, conn, datastock_id)
+                batch = EpdBatch()
+
+        stored_count += flush_batch(batch, conn, datastock_id)
+    except Exception as store_error:
+        # Batches committed before the error are kept
+        logger.error(f"Failed to store data from folder {folder_name}: {store_error}")
+        logger.error(traceback.format_exc())
+        conn.rollback()
+
+    logger.info(f"Processing complete for folder {folder_name}. Stored {stored_count} new EPDs from {total_files} files.")
+    return stored_count
+
+def run_folder(pool, data_dir, folder_name, executor, positions):
+    """Process one datastock folder on its own pooled connection and progress bar line."""
+    conn = pool.getconn()
+    position = positions.get()
+    try:
+        logger.info(f"Processing datastock folder: {folder_name}")
+        return process_datastock_folder(data_dir, folder_name, conn, executor, position)
+    finally:
+        positions.put(position)
+        pool.putconn(conn, close=bool(conn.closed))
 
 def store_data(data_dir):
-    conn = None
+    pool = None
     try:
-        conn = connect_to_db()
+        pool = create_connection_pool()
         logger.info(f"Connected to database {DB_PARAMS['dbname']} on {DB_PARAMS['host']}")
 
-        # Load translations
-        translations = load_translations()
-        
         # Get all subdirectories in the data directory
-        data_folders = [f for f in os.listdir(data_dir) if os.path.isdir(os.path.join(data_dir, f)) 
-                        and f.startswith("data_stock_")]
+        with os.scandir(data_dir) as it:
+            data_folders = [e.name for e in it if e.is_dir() and e.name.startswith("data_stock_")]
         
-        total_processed = 0
-        
-        for folder in data_folders:
-            logger.info(f"Processing datastock folder: {folder}")
-            processed = process_datastock_folder(data_dir, folder, conn, translations)
-            total_processed += processed
+        # One progress bar line per concurrent writer
+        positions = queue.Queue()
+        for position in range(DB_WRITERS):
+            positions.put(position)
+
+        # Parsing is CPU-bound and runs on all cores; folders are written concurrently,
+        # each on its own connection since cursors must not be shared between threads.
+        # Parsers are spawned rather than forked, as forking a threaded process with
+        # open connections is unsafe.
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=get_context("spawn")) as executor, \
+                ThreadPoolExecutor(max_workers=DB_WRITERS) as writers:
+            futures = [
+                writers.submit(run_folder, pool, data_dir, folder, executor, positions)
+                for folder in data_folders
+            ]
+            total_processed = sum(future.result() for future in futures)
         
         logger.info(f"Total EPDs processed across all datastocks: {total_processed}")
+
+        if BULK_LOAD:
+            conn = pool.getconn()
+            try:
+                finish_bulk_load(conn)
+            finally:
+                pool.putconn(conn)
         
         # Save missing translations
         if not_found_translations:
             translation_file = os.path.join(log_dir, "translations_not_found.txt")
             with open(translation_file, "w", encoding="utf-8") as f:
-                for item in not_found_translations:
+                for item in sorted(not_found_translations):
                     if item:  # Only write non-empty strings
                         f.write(f"{item}\n")
             logger.info(f"Saved {len(not_found_translations)} missing translations to {translation_file}")
@@ -656,9 +529,9 @@ def store_data(data_dir):
         logger.error(f"Error in store_data function: {e}")
         logger.error(f"Detailed error traceback:\n{traceback.format_exc()}")
     finally:
-        if conn:
-            conn.close()
-            logger.info("Database connection closed.")
+        if pool:
+            pool.closeall()
+            logger.info("Database connections closed.")
 
 def convert_to_float(val):
     try:
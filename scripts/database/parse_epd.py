@@ -0,0 +1,348 @@
+"""
+EPD JSON parsing, split from the database code so it can be compiled with mypyc.
+mypyc is an optional dev dependency that ships with mypy:
+
+    pip install mypy
+    mypyc scripts/database/parse_epd.py
+
+The resulting extension is imported instead of this file when present.
+"""
+import csv
+import json
+import logging
+import re
+import sys
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# orjson parses EPD files several times faster than the stdlib; fall back if it is not installed
+json_loads: Callable[[bytes], Any]
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# --- Translation file path ---
+TRANSLATIONS_FILE = "./scripts/database/data/translations.csv"
+
+# Global set to track missing translations
+not_found_translations: Set[str] = set()
+
+_STRIP_COMMAS = str.maketrans({",": ""})
+
+def normalize_translation_key(text: str) -> str:
+    """Normalize German text the same way for translation keys and lookups."""
+    return text.translate(_STRIP_COMMAS).strip().casefold()
+
+def load_translations(csv_file: str = TRANSLATIONS_FILE) -> Dict[str, str]:
+    """Load translations from a CSV file."""
+    translations: Dict[str, str] = {}
+    try:
+        with open(csv_file, 'r', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            for row in reader:
+                if len(row) >= 2:
+                    german = row[0].strip()
+                    english = row[1].strip()
+                    if german and english:
+                        translations[sys.intern(normalize_translation_key(german))] = english
+        logger.info(f"Loaded {len(translations)} translations.")
+    except FileNotFoundError:
+        logger.warning(f"Translation file {csv_file} not found.")
+    return translations
+
+# Loaded once per process; category values repeat across thousands of EPDs
+_TRANS = load_translations()
+
+@lru_cache(maxsize=8192)
+def translate_text(text: Optional[str]) -> Optional[str]:
+    """Translate text from German to English if a translation exists."""
+    if not text:
+        return text
+
+    cleaned_text = normalize_translation_key(text)
+    if cleaned_text not in _TRANS:
+        logger.debug(f"Warning: Translation for '{text}' not found.")
+        not_found_translations.add(text)
+        return text
+
+    return _TRANS[cleaned_text]
+
+target_indicators = set([
+    "PERE", "PERM", "PERT", "PENRE", "PENRM", "PENRT", "SM", "RSF", "NRSF", "FW",
+    "HWD", "NHWD", "RWD", "CRU", "MFR", "MER", "EEE", "EET",
+    "GWP-total", "GWP-biogenic", "GWP-fossil", "GWP-luluc", "ODP", "POCP",
+    "AP", "EP-terrestrial", "EP-freshwater", "EP-marine", "WDP",
+    "ADPE", "ADPF", "HTP-c", "HTP-nc", "PM", "IR", "ETP-fw", "SQP"
+])
+
+# One alternation compiled once; longest keys first so "GWP-total" wins over shorter overlaps
+INDICATOR_RE = re.compile(
+    r'\b(' + '|'.join(re.escape(k) for k in sorted(target_indicators, key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+# Maps a case-insensitive match back to the canonical key
+_CANON = {k.lower(): k for k in target_indicators}
+
+def get_indicator_key(multilang_dict: Any) -> Optional[str]:
+    if not isinstance(multilang_dict, dict):
+        return None
+    for lang_text in multilang_dict.values():
+        if not isinstance(lang_text, str):
+            continue
+        m = INDICATOR_RE.search(lang_text)
+        if m:
+            return _CANON[m.group(1).lower()]
+    return None
+
+def extract_multilang(entry_list: Any) -> Dict[str, Any]:
+    if not isinstance(entry_list, list):
+        return {}
+    return {entry.get("lang", "unknown"): entry.get("value") for entry in entry_list if isinstance(entry, dict)}
+
+def to_epoch_millis(unix_timestamp: Any) -> Optional[int]:
+    """Validate a Unix timestamp in milliseconds; the database converts it to a TIMESTAMP on insert."""
+    if not unix_timestamp:
+        return None
+    try:
+        return int(unix_timestamp)
+    except (ValueError, TypeError):
+        logger.warning(f"Failed to convert timestamp: {unix_timestamp}")
+        return None
+
+def extract_original_epd_url(dstr: Dict[str, Any]) -> Optional[str]:
+    """Extract the original EPD URL from the dataSourcesTreatmentAndRepresentativeness subtree."""
+    try:
+        original_epd = dstr.get("other", {}).get("anies", [])
+        for item in original_epd:
+            if item.get("name") == "referenceToOriginalEPD":
+                value = item.get("value", {})
+                resource_urls = value.get("resourceURLs", [])
+                if resource_urls:
+                    return resource_urls[0]
+    except (KeyError, TypeError) as e:
+        logger.warning(f"Failed to extract original EPD URL: {e}")
+    return None
+    
+def parse_exchange_like(entry: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Dict[str, Any]]]:
+    """Extract the unit and per-module amounts of an exchange or LCIA result.
+
+    Walks entry["other"]["anies"] once; if several unit references exist, the last one wins.
+    """
+    unit: Optional[str] = None
+    module_amounts: Dict[str, Dict[str, Any]] = {}
+    for x in entry.get("other", {}).get("anies", []):
+        get = x.get
+        if get("name") == "referenceToUnitGroupDataSet":
+            unit_value = get("value")
+            if isinstance(unit_value, dict) and "shortDescription" in unit_value:
+                for desc in unit_value.get("shortDescription", []):
+                    if isinstance(desc, dict) and "value" in desc:
+                        unit = desc.get("value")
+                        break
+        if "module" in x:
+            # Raw value; converted to float per batch when storing
+            module_amounts[get("module")] = {
+                "amount": get("value"),
+                "scenario": get("scenario", "")
+            }
+    return unit, module_amounts
+
+def parse_json(json_path: str) -> Dict[str, Any]:
+    with open(json_path, "rb") as f:
+        data = json_loads(f.read())
+
+    # Resolve the subtrees used repeatedly below once
+    pi = data.get("processInformation", {})
+    dsi = pi.get("dataSetInformation", {})
+    mv = data.get("modellingAndValidation", {})
+    dstr = mv.get("dataSourcesTreatmentAndRepresentativeness", {})
+    admin = data.get("administrativeInformation", {})
+    publication = admin.get("publicationAndOwnership", {})
+    exchange_list = data.get("exchanges", {}).get("exchange", [])
+
+    uuid = dsi.get("UUID", "")
+    version = publication.get("dataSetVersion", "")
+    process_id = f"{uuid}_{version}"
+
+    name = extract_multilang(dsi.get("name", {}).get("baseName", []))
+    comment = extract_multilang(dsi.get("generalComment", []))
+    time = pi.get("time", {})
+    reference_year = time.get("referenceYear")
+    valid_until = time.get("dataSetValidUntil")
+    time_representativeness: Dict[str, Any] = {}
+
+    safety_margins: Dict[str, Any] = {
+        'margin': None,
+        'description': {}
+    }
+
+    geo = pi.get("geography", {}).get("locationOfOperationSupplyOrProduction", {})
+    geography = {
+        'location': geo.get("location"),
+        'description': {}
+    }
+
+    tech = pi.get("technology", {})
+    technology_description = extract_multilang(tech.get("technologyDescriptionAndIncludedProcesses", []))
+    tech_applicability = extract_multilang(tech.get("technologicalApplicability", []))
+
+    method_info = mv.get("LCIMethodAndAllocation", {})
+    dataset_type = method_info.get("typeOfDataSet")
+    dataset_subtype = next((el["value"] for el in method_info.get("other", {}).get("anies", []) if el.get("name") == "subType"), None)
+
+    sources = ', '.join(
+        el["shortDescription"][0]["value"]
+        for el in dstr.get("referenceToDataSource", [])
+        if el.get("shortDescription")
+    )
+
+    use_advice = extract_multilang(dstr.get("useAdviceForDataSet", []))
+
+    original_epd_url = extract_original_epd_url(dstr)
+
+    reviews: List[Dict[str, Any]] = []
+    for r in mv.get("validation", {}).get("review", []):
+        reviewers = [e["shortDescription"][0]["value"] for e in r.get("referenceToNameOfReviewerAndInstitution", []) if e.get("shortDescription")]
+        reviews.append({"reviewers": reviewers, "details": {}})
+
+    compliances: List[Dict[str, Any]] = []
+    for c in mv.get("complianceDeclarations", {}).get("compliance", []):
+        short = c.get("referenceToComplianceSystem", {}).get("shortDescription", [])
+        system = extract_multilang(short)
+        compliances.append({"system": system, "approval": None})
+
+    entry = admin.get("dataEntryBy", {})
+    admin_info = {
+        'generator': extract_multilang(admin.get("dataGenerator", {}).get("referenceToPersonOrEntityGeneratingTheDataSet", [{}])[0].get("shortDescription", [])),
+        'entry_by': extract_multilang(entry.get("referenceToDataSetFormat", [{}])[0].get("shortDescription", [])),
+        'timestamp': to_epoch_millis(entry.get("timeStamp")),
+        'formats': [
+                    next((desc.get("value") for desc in fmt.get("shortDescription", []) if isinstance(desc, dict) and "value" in desc), None)
+                    for fmt in entry.get("referenceToDataSetFormat", [])
+                    ],
+        'version': publication.get("dataSetVersion"),
+        'license': publication.get("licenseType"),
+        'access': extract_multilang(publication.get("accessRestrictions", []))
+    }
+
+    classifications: List[Dict[str, Any]] = []
+    for c in dsi.get("classificationInformation", {}).get("classification", []):
+        # The classification system name is part of the Classifications primary key
+        if not c.get("name"):
+            continue
+        for cl in c.get("class", []):
+            # Both are part of the primary key, so an explicit null becomes ""
+            level = cl.get("level")
+            class_id = cl.get("classId")
+            classifications.append({
+                "name": c.get("name"),
+                "level": "" if level is None else level,
+                "classId": "" if class_id is None else class_id,
+                "classification": cl.get("value")
+            })
+
+    exchanges: List[Dict[str, Any]] = []
+    for ex in exchange_list:
+        flow_ref = ex.get("referenceToFlowDataSet", {})
+        flow = extract_multilang(flow_ref.get("shortDescription", []))
+        indicator_key = get_indicator_key(flow)
+        direction = ex.get("exchange direction")
+        meanAmount = ex.get("meanAmount")
+        unit, module_amounts = parse_exchange_like(ex)
+        exchanges.append({
+            'data_set_internal_id': ex.get("dataSetInternalID"),
+            'reference_to_flow': None,
+            'uri': flow_ref.get("uri"),
+            'ref_object_id': flow_ref.get("refObjectId"),
+            'flow': flow,
+            'indicator_key': indicator_key,
+            'direction': direction,
+            'meanAmount': meanAmount,
+            'unit': unit,
+            'module_amounts': module_amounts
+        })
+
+    lcia_results: List[Dict[str, Any]] = []
+    for lcia in data.get("LCIAResults", {}).get("LCIAResult", []):
+        method = extract_multilang(lcia.get("referenceToLCIAMethodDataSet", {}).get("shortDescription", []))
+        indicator_key = get_indicator_key(method)
+        meanAmount = lcia.get("meanAmount")
+        unit, module_amounts = parse_exchange_like(lcia)
+        lcia_results.append({
+            'method': method,
+            'indicator_key': indicator_key,
+            'meanAmount': meanAmount,
+            'unit': unit,
+            'module_amounts': module_amounts
+        })
+
+    reference_flow_id = pi["quantitativeReference"]["referenceToReferenceFlow"][0]
+    reference_flow: List[Dict[str, Any]] = []
+    for ex in exchange_list:
+        if ex.get("dataSetInternalID") == reference_flow_id:
+            mat_props = ex.get("materialProperties", [])
+            flow_props = ex.get("flowProperties", [])
+            ref_flow_props: List[Dict[str, Any]] = []
+            for prop in flow_props:
+                prop_names = prop.get("name", [])
+                ref_flow_props.append({
+                    "name_en": next((n["value"] for n in prop_names if n.get("lang") == "en"), None),
+                    "name_de": next((n["value"] for n in prop_names if n.get("lang") == "de"), None),
+                    "mean_value": prop.get("meanValue"),
+                    "unit": prop.get("referenceUnit"),
+                    "is_reference": prop.get("referenceFlowProperty", False),
+                    "dataSetInternalID": prop.get("uuid")
+                })
+            reference_flow.append({
+                'material_properties': {mp['name']: {
+                    'value': mp['value'],
+                    'units': mp['unit'],
+                    'description': mp.get('unitDescription')
+                } for mp in mat_props},
+                'flow_properties': ref_flow_props
+            })
+
+    # Extract categories from the oekobau.dat classification in a single pass
+    levels: Dict[int, Optional[str]] = {}
+    for c in classifications:
+        if (c.get("name") or "").lower() == "oekobau.dat":
+            try:
+                level = int(c.get("level", "0"))
+            except (ValueError, TypeError):
+                continue
+            levels[level] = translate_text(c.get("classification"))
+    category_level_1, category_level_2, category_level_3 = levels.get(0), levels.get(1), levels.get(2)
+
+    return {
+        'process_id': process_id,
+        'uuid': uuid,
+        'version': version,
+        'name': name,
+        'description': comment,
+        'category_level_1': category_level_1,
+        'category_level_2': category_level_2,
+        'category_level_3': category_level_3,
+        'classifications': classifications,
+        'reference_year': reference_year,
+        'valid_until': valid_until,
+        'time_representativeness': time_representativeness,
+        'safety_margins': safety_margins,
+        'geography': geography,
+        'technology_description': technology_description,
+        'tech_applicability': tech_applicability,
+        'dataset_type': dataset_type,
+        'dataset_subtype': dataset_subtype,
+        'sources': sources,
+        'use_advice': use_advice,
+        'reviews': reviews,
+        'compliances': compliances,
+        'admin_info': admin_info,
+        'exchanges': exchanges,
+        'lcia_results': lcia_results,
+        'reference_flow': reference_flow,
+        'original_epd_url': original_epd_url
+    }
@@ -0,0 +1,246 @@
+-- Schema for the EPD database. Executed in one batch by 01_create_database.py.
+-- PostgreSQL does not index foreign key columns by itself, so each one gets an explicit index
+-- unless it already leads a primary key.
+-- Fixed-width columns are declared before TEXT columns to avoid alignment padding inside rows.
+
+-- Everything lives in the epd schema, so a fresh start is a single
+-- DROP SCHEMA epd CASCADE instead of dropping each table in dependency order,
+-- followed by re-running 01_create_database.py, which notices the missing tables.
+-- 01_create_database.py puts epd first on the database's search_path.
+CREATE SCHEMA IF NOT EXISTS epd;
+SET LOCAL search_path TO epd;
+
+-- Databases created before the epd schema keep their tables in public. Move them
+-- over so the unqualified CREATE TABLE statements below do not shadow them with empty copies.
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOR t IN
+        SELECT tablename FROM pg_tables
+        WHERE schemaname = 'public'
+          AND tablename IN (
+            'datastocks',
+            'products',
+            'compliances',
+            'classifications',
+            'exchanges',
+            'exchange_moduleamounts',
+            'lcia_results',
+            'lcia_moduleamounts',
+            'reviews',
+            'flow_properties',
+            'material_properties',
+            'materials',
+            'uses',
+            'indicators',
+            'modules'
+          )
+          AND to_regclass('epd.' || quote_ident(tablename)) IS NULL
+    LOOP
+        EXECUTE format('ALTER TABLE public.%I SET SCHEMA epd', t);
+    END LOOP;
+END $$;
+
+-- Indicator keys are a fixed set (target_indicators in 02_store_epds_in_db.py plus the
+-- descriptions in 02_1_populate_indicators_and_modules.py). As an ENUM they take 4 bytes
+-- per row and compare as integers. New keys need ALTER TYPE indicator_key_t ADD VALUE.
+DO $$ BEGIN
+    CREATE TYPE indicator_key_t AS ENUM (
+        'PERE', 'PERM', 'PERT', 'PENRE', 'PENRM', 'PENRT', 'SM', 'RSF', 'NRSF', 'FW', 'HWD',
+        'NHWD', 'RWD', 'CRU', 'MFR', 'MER', 'EEE', 'EET', 'GWP-total', 'GWP-fossil',
+        'GWP-biogenic', 'GWP-luluc', 'ODP', 'POCP', 'AP', 'EP-terrestrial', 'EP-freshwater',
+        'EP-marine', 'WDP', 'ADPE', 'ADPF', 'HTP-c', 'HTP-nc', 'PM', 'IR', 'ETP-fw', 'SQP',
+        'IRP', 'GWP', 'EP', 'SF'
+    );
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+CREATE TABLE IF NOT EXISTS DataStocks (
+    datastock_id SERIAL PRIMARY KEY,
+    name TEXT NOT NULL,
+    uuid TEXT UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS Products (
+    timestamp TIMESTAMP,
+    datastock_id INTEGER,
+    process_id TEXT PRIMARY KEY,
+    uuid TEXT,
+    version TEXT,
+    name_en TEXT,
+    name_en_AI TEXT,
+    name_de TEXT,
+    category_level_1 TEXT,
+    category_level_2 TEXT,
+    category_level_3 TEXT,
+    description_en TEXT,
+    description_en_AI TEXT,
+    description_de TEXT,
+    short_desc_en_AI TEXT,
+    reference_year TEXT,
+    valid_until TEXT,
+    time_repr_en TEXT,
+    time_repr_de TEXT,
+    safety_margin TEXT,
+    safety_descr_en TEXT,
+    safety_descr_de TEXT,
+    geo_location TEXT,
+    geo_descr_en TEXT,
+    geo_descr_de TEXT,
+    tech_descr_en TEXT,
+    tech_descr_en_AI TEXT,
+    tech_descr_de TEXT,
+    tech_applic_en TEXT,
+    tech_applic_en_AI TEXT,
+    tech_applic_de TEXT,
+    dataset_type TEXT,
+    dataset_subtype TEXT,
+    sources TEXT,
+    use_advice_en TEXT,
+    use_advice_de TEXT,
+    generator_en TEXT,
+    generator_de TEXT,
+    entry_by_en TEXT,
+    entry_by_de TEXT,
+    admin_version TEXT,
+    license_type TEXT,
+    access_en TEXT,
+    access_de TEXT,
+    formats TEXT,
+    original_epd_url TEXT,
+    FOREIGN KEY (datastock_id) REFERENCES DataStocks (datastock_id)
+);
+CREATE INDEX IF NOT EXISTS idx_products_datastock_id ON Products (datastock_id);
+
+CREATE TABLE IF NOT EXISTS Compliances (
+    compliance_id SERIAL PRIMARY KEY,
+    process_id TEXT,
+    system_en TEXT,
+    system_de TEXT,
+    approval TEXT,
+    FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_compliances_process_id ON Compliances (process_id);
+
+CREATE TABLE IF NOT EXISTS Classifications (
+    process_id TEXT,
+    name TEXT,
+    level TEXT,
+    classId TEXT,
+    classification TEXT,
+    PRIMARY KEY (process_id, name, level, classId),
+    FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Exchanges (
+    exchange_id SERIAL PRIMARY KEY,
+    meanAmount DOUBLE PRECISION,
+    process_id TEXT,
+    flow_en TEXT,
+    flow_en_AI TEXT,
+    flow_de TEXT,
+    indicator_key indicator_key_t,
+    direction TEXT,
+    unit TEXT,
+    FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_exchanges_process_id ON Exchanges (process_id);
+
+CREATE TABLE IF NOT EXISTS Exchange_ModuleAmounts (
+    module_amount_id SERIAL PRIMARY KEY,
+    exchange_id INTEGER,
+    amount DOUBLE PRECISION,
+    module TEXT,
+    scenario TEXT,
+    FOREIGN KEY (exchange_id) REFERENCES Exchanges (exchange_id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_exchange_moduleamounts_exchange_id ON Exchange_ModuleAmounts (exchange_id);
+
+CREATE TABLE IF NOT EXISTS LCIA_Results (
+    lcia_id SERIAL PRIMARY KEY,
+    meanAmount DOUBLE PRECISION,
+    process_id TEXT,
+    method_en TEXT,
+    method_en_AI TEXT,
+    method_de TEXT,
+    indicator_key indicator_key_t,
+    unit TEXT,
+    FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_lcia_results_process_id ON LCIA_Results (process_id);
+
+CREATE TABLE IF NOT EXISTS LCIA_ModuleAmounts (
+    lcia_module_amount_id SERIAL PRIMARY KEY,
+    lcia_id INTEGER,
+    amount DOUBLE PRECISION,
+    module TEXT,
+    scenario TEXT,
+    FOREIGN KEY (lcia_id) REFERENCES LCIA_Results (lcia_id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_lcia_moduleamounts_lcia_id ON LCIA_ModuleAmounts (lcia_id);
+
+CREATE TABLE IF NOT EXISTS Reviews (
+    review_id SERIAL PRIMARY KEY,
+    process_id TEXT,
+    reviewer TEXT,
+    detail_en TEXT,
+    detail_de TEXT,
+    FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_process_id ON Reviews (process_id);
+
+CREATE TABLE IF NOT EXISTS Flow_Properties (
+    flow_property_id SERIAL PRIMARY KEY,
+    process_id TEXT,
+    name_en TEXT,
+    name_en_AI TEXT,
+    name_de TEXT,
+    meanAmount TEXT,
+    unit TEXT,
+    is_reference BOOLEAN DEFAULT FALSE,
+    FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_flow_properties_process_id ON Flow_Properties (process_id);
+
+CREATE TABLE IF NOT EXISTS Material_Properties (
+    material_prop_id SERIAL PRIMARY KEY,
+    process_id TEXT,
+    property_id TEXT,
+    property_name TEXT,
+    value TEXT,
+    units TEXT,
+    description TEXT,
+    FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_material_properties_process_id ON Material_Properties (process_id);
+
+CREATE TABLE IF NOT EXISTS Materials (
+    process_id TEXT,
+    material TEXT,
+    list_order TEXT,
+    PRIMARY KEY (process_id, list_order),
+    FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Uses (
+    process_id TEXT,
+    use_case TEXT,
+    list_order TEXT,
+    PRIMARY KEY (process_id, list_order),
+    FOREIGN KEY (process_id) REFERENCES Products (process_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Indicators (
+    indicator_key indicator_key_t PRIMARY KEY,
+    name TEXT NOT NULL,
+    short_description TEXT,
+    long_description TEXT
+);
+
+CREATE TABLE IF NOT EXISTS Modules (
+    module_code TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    short_description TEXT,
+    long_description TEXT
+);